@@ -29,7 +29,8 @@ class GitRefType(StrEnum):
         else:
             return "branches and tags"    
 
-@dataclass
+# Frozen, as a git ref never changes once resolved and can then be shared and hashed
+@dataclass(frozen=True)
 class GitRef:
     name: str
     sha: str
@@ -5,14 +5,13 @@ Module for utility functions.
 import os
 import re
 import subprocess
-import requests
 import json
 from copy import copy
 from subprocess import SubprocessError
 from functools import partial
 from itertools import count
-from typing import Optional, Sequence, Iterable
-from bs4 import BeautifulSoup
+from typing import Callable, Optional, Sequence, Iterable
+from bs4 import BeautifulSoup, SoupStrainer
 from markdown import Markdown
 from markdown.extensions.toc import TocExtension
 from mkdocs.structure.files import File, Files
@@ -26,6 +25,13 @@ from include_stubs.logging import get_custom_logger
 logger = get_custom_logger(__name__)
 GITHUB_URL = "https://github.com/"
 GITHUB_SSH = "git@github.com:"
+# GitHub repository in the format OWNER/REPO (owner names cannot contain dots)
+GITHUB_REPO_PATTERN = re.compile(r"[a-zA-Z0-9_-]+/[a-zA-Z0-9_.-]+")
+# Only build the <h1> elements when parsing HTML stubs to extract their title.
+H1_STRAINER = SoupStrainer("h1")
+# Markdown parser used to extract the title of MarkDown stubs.
+# It is created once and reset before each conversion.
+MD_TITLE_PARSER = Markdown(extensions=[TocExtension(toc_depth="1")])
 
 
 class GitHubApiRateLimitError(Exception):
@@ -207,7 +213,8 @@ def get_repo_from_url(repo_url: str) -> str:
     for prefix in (GITHUB_URL, GITHUB_SSH):
         if repo_url.startswith(prefix):
             remainder = repo_url.removeprefix(prefix)
-            repo = "/".join(remainder.split("/")[0:2]).removesuffix(".git")
+            # Only split off OWNER and REPO, leaving the rest of the URL untouched
+            repo = "/".join(remainder.split("/", 2)[:2]).removesuffix(".git")
             return repo
     raise ValueError(f"Invalid GitHub repo URL: '{repo_url}'")
 
@@ -238,9 +245,9 @@ def get_repo_from_input(repo_config_input: Optional[str]) -> str:
         raise ValueError(
             "Cannot determine GitHub repository. No GitHub repository specified in the plugin configuration and local directory is not a git repository."
         )
-    if repo.startswith(GITHUB_URL) or repo.startswith(GITHUB_SSH):
+    if repo.startswith((GITHUB_URL, GITHUB_SSH)):
         repo = get_repo_from_url(repo)
-    if not re.fullmatch(r"[a-zA-Z0-9_.-]+/[a-zA-Z0-9_.-]+", repo):
+    if not GITHUB_REPO_PATTERN.fullmatch(repo):
         raise ValueError(f"Invalid GitHub repo: '{repo}'")
     return repo
 
@@ -342,7 +349,7 @@ def get_html_title(content: str) -> Optional[str]:
             The title of the HTML file.
             Returns None if no title is found.
     """
-    soup = BeautifulSoup(content, "html.parser")
+    soup = BeautifulSoup(content, "html.parser", parse_only=H1_STRAINER)
     h1 = soup.find("h1")
     return h1.get_text() if h1 else None
 
@@ -358,15 +365,38 @@ def get_md_title(content: str) -> Optional[str]:
             The title of the MarkDown file.
             Returns None if no title is found.
     """
-    md = Markdown(extensions=[TocExtension(toc_depth="1")])
-    md.convert(content)
-    toc_tokens = md.toc_tokens
+    MD_TITLE_PARSER.reset()
+    MD_TITLE_PARSER.convert(content)
+    toc_tokens = MD_TITLE_PARSER.toc_tokens  # type: ignore[attr-defined]
 
     if toc_tokens:
         return toc_tokens[0]["name"]  # First h1-level heading
     return None
 
 
+# Functions to get the stub title from its content, for each file format.
+# MarkDown is used for any other file format.
+TITLE_GETTERS = {
+    ".html": get_html_title,
+    ".md": get_md_title,
+}
+
+
+def get_title_getter(fname: str) -> Callable[[str], Optional[str]]:
+    """
+    Get the function to extract the title of a stub from its content, based on its file name.
+
+    Args:
+        fname: Str
+            The file name of the stub.
+
+    Returns:
+        Callable
+            The function that returns the title of the stub from its content.
+    """
+    return TITLE_GETTERS.get(os.path.splitext(fname)[1], get_md_title)
+
+
 def set_stubs_nav_path(
     stubs_nav_path: Optional[str],
     stubs_parent_url: str,
@@ -689,20 +719,47 @@ class StubList(list):
         query_parts.append("}}")
         return "".join(query_parts)
 
-    def _populate_remote_stub_fnames(
+    def _get_graphql_contents_query_string(
         self,
-    ) -> None:
+    ) -> str:
         """
-        Uses GitHub GraphQL API to get the name of the remote stub file from its git ref, for each
-        remote Stub in self.
-        If exactly one file in a supported format is found, it sets the fname attribute of the
-        corresponding Stub. Otherwise, it removes the Stub from self.
+        Generate a GraphQL query string to fetch the content
+        of the stub file from a GitHub repository for each of
+        the remote stubs in self.
 
         Returns:
-            None
-                It modifies self in place.
+            Str
+                The GraphQL query string.
+        """
+        repo_owner, repo_name = self.repo.split("/")
+        query_parts = [
+            f'query {{ repository(owner: "{repo_owner}", name: "{repo_name}") {{',
+        ]
+        for stub in self.remote_stubs:
+            gitsha = stub.gitref.sha
+            # Aliased as in _get_graphql_query_string. The expression is JSON-encoded so that
+            # quotes or backslashes in the path cannot break the whole batched query.
+            expression = json.dumps(f"{gitsha}:{self.stubs_dir}/{stub.fname}")
+            query_parts.append(
+                f"r_{gitsha}: object(expression: {expression}) {{ ... on Blob {{ text isTruncated }}}}"
+            )
+        query_parts.append("}}")
+        return "".join(query_parts)
+
+    def _run_graphql_query(self, query_string: str, description: str) -> dict:
+        """
+        Run a GraphQL query on the GitHub repository using the GitHub CLI.
+
+        Args:
+            query_string: Str
+                The GraphQL query string.
+            description: Str
+                What the query retrieves, used in the error message.
+
+        Returns:
+            Dict
+                The repository data of the GraphQL response.
         """
-        query_string = self._get_graphql_query_string()
         try:
             command = ["gh", "api", "graphql", "-f", f"query={query_string}"]
             output = run_command(command)
@@ -711,12 +768,29 @@ class StubList(list):
                 raise GitHubApiRateLimitError()
             else:
                 raise ValueError(
-                    f"Failed to retrieve the remote stub filenames for the repository {self.repo!r}. "
+                    f"Failed to retrieve the {description} for the repository {self.repo!r}. "
                     "Please check the repository name and your network connection."
                 )
+        return json.loads(output)["data"]["repository"]
+
+    def _populate_remote_stub_fnames(
+        self,
+    ) -> None:
+        """
+        Uses GitHub GraphQL API to get the name of the remote stub file from its git ref, for each
+        remote Stub in self.
+        If exactly one file in a supported format is found, it sets the fname attribute of the
+        corresponding Stub. Otherwise, it removes the Stub from self.
+
+        Returns:
+            None
+                It modifies self in place.
+        """
+        refcontents = self._run_graphql_query(
+            self._get_graphql_query_string(), "remote stub filenames"
+        )
         # For each ref, inspect the response and set the fname attribute if exactly one file in
         # the supported file format is found
-        refcontents = json.loads(output)["data"]["repository"]
         for remotestub in self.remote_stubs:
             content = refcontents[f'r_{remotestub.gitref.sha}']
             if (
@@ -771,23 +845,35 @@ class StubList(list):
         self,
     ) -> None:
         """
-        Get the content of each remote Stub in self from the GitHub repository.
+        Uses GitHub GraphQL API to get the content of each remote Stub in self,
+        with a single query for all the stubs.
 
         Returns:
             None
                 It modifies self in place.
         """
+        if not self.remote_stubs:
+            return
+        refcontents = self._run_graphql_query(
+            self._get_graphql_contents_query_string(), "remote stub contents"
+        )
         for remotestub in self.remote_stubs:
-            raw_url = f"https://raw.githubusercontent.com/{self.repo}/{remotestub.gitref.sha}/{self.stubs_dir}/{remotestub.fname}"
-            try:
-                raw_resp = requests.get(raw_url)
-                raw_resp.raise_for_status()
-            except requests.RequestException:
-                # Otherwise, remove the Stub from the items
+            blob = refcontents[f"r_{remotestub.gitref.sha}"]
+            # The text is None for binary files, and missing for objects that are not blobs
+            # (e.g., a directory or submodule with a stub-like name)
+            if blob is None or blob.get("text") is None:
+                # Remove the Stub from the items
+                self.remove(remotestub)
+            elif blob["isTruncated"]:
+                # GitHub truncates the text of large blobs, which must not be published cut short
+                logger.warning(
+                    f"The stub {remotestub.fname!r} for git reference {remotestub.gitref!r} is "
+                    "too large to be retrieved in full. Skipping this git reference."
+                )
                 self.remove(remotestub)
             else:
                 # If a content is found, set it as the Stub content attribute
-                remotestub.content = raw_resp.text
+                remotestub.content = blob["text"]
     
     def _populate_local_stub_content(
         self,
@@ -815,10 +901,7 @@ class StubList(list):
                 It modifies self in place.
         """
         for remotestub in self.remote_stubs:
-            if remotestub.fname.endswith(".html"):  # html
-                remotestub.title = get_html_title(remotestub.content)
-            else:  # markdown
-                remotestub.title = get_md_title(remotestub.content)
+            remotestub.title = get_title_getter(remotestub.fname)(remotestub.content)
     
     def _populate_local_stub_title(
         self,
@@ -831,10 +914,7 @@ class StubList(list):
                 It modifies self in place.
         """
         if (localstub := self.local_stub): # pragma: no branch
-            if localstub.fname.endswith(".html"):  # type: ignore[union-attr]
-                localstub.title = get_html_title(localstub.content) # type: ignore[arg-type]
-            else:
-                localstub.title = get_md_title(localstub.content) # type: ignore[arg-type]
+            localstub.title = get_title_getter(localstub.fname)(localstub.content) # type: ignore[arg-type]
 
     def _create_stub_file(self, stub: Stub) -> File:
         """
@@ -1,8 +1,12 @@
+import logging
 from unittest.mock import MagicMock
 
 import pytest
 from mkdocs.structure.nav import Navigation, Section
 from mkdocs.structure.pages import Page
+from include_stubs import utils
+from include_stubs.cli import logger as cli_logger
+from include_stubs.config import SUPPORTED_FILE_FORMATS
 from include_stubs.utils import StubList, Stub, GitRef, run_command
 from warnings import warn
 from subprocess import SubprocessError
@@ -27,6 +31,61 @@ def pytest_sessionfinish(session, exitstatus):
         new_used_requests = get_used_gh_api_requests()
         assert old_used_requests == new_used_requests, f"The number of used GitHub API requests changed during tests.\nOutputs of the command `gh api rate_limit` before and after running the tests:\nBefore: {old_used_requests}\nAfter: {new_used_requests}\n"
 
+class CommandRegistry:
+    """
+    In-process replacement for `include_stubs.utils.run_command`.
+
+    Outcomes are registered per command with `add` and replayed in the order they were added,
+    with the last outcome of a command replayed for any further call. A non-zero returncode
+    makes the command raise a SubprocessError, as `run_command` does.
+    The commands run (as tuples) are collected in the `seen` set, and in call order in `calls`.
+    """
+
+    def __init__(self):
+        self.outcomes = {}
+        self.seen = set()
+        self.calls = []
+
+    def add(self, command, stdout="", returncode=0):
+        self.outcomes.setdefault(tuple(command), []).append((stdout, returncode))
+
+    def run_command(self, command):
+        command = tuple(command)
+        self.seen.add(command)
+        self.calls.append(command)
+        outcomes = self.outcomes[command]
+        stdout, returncode = outcomes.pop(0) if len(outcomes) > 1 else outcomes[0]
+        if returncode:
+            raise SubprocessError(
+                f"Command '{' '.join(command)}' failed with return code {returncode}."
+            )
+        return stdout.strip()
+
+
+@pytest.fixture
+def cmd_registry(monkeypatch):
+    """
+    Replace `include_stubs.utils.run_command` with a CommandRegistry, so no subprocess is run.
+    The registry is created per test, so registered outcomes never leak between tests.
+    """
+    registry = CommandRegistry()
+    monkeypatch.setattr(utils, "run_command", registry.run_command)
+    return registry
+
+
+@pytest.fixture(scope="session", autouse=True)
+def silence_logs():
+    """Silence the plugin loggers (shared by the plugin and utils modules) and the CLI logger."""
+    for logger in (utils.logger, cli_logger):
+        logger.setLevel(logging.CRITICAL)
+
+
+@pytest.fixture(scope="session")
+def supported_file_formats():
+    """Stub file formats supported by the plugin."""
+    return SUPPORTED_FILE_FORMATS
+
+
 @pytest.fixture
 def mock_files():
     """Factory function to create the Files object."""
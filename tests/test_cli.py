@@ -1,10 +1,8 @@
 from unittest.mock import patch, MagicMock
 
 import pytest
-import logging
 
 from include_stubs.cli import (
-    logger,
     is_default_mkdocs_to_be_run,
     run_default_mkdocs_command,
     get_plugin_config,
@@ -34,11 +32,6 @@ def test_get_default_mkdocs_arguments(command, other_args, expected_output):
     assert get_default_mkdocs_arguments(command, other_args) == expected_output
 
 
-@pytest.fixture(autouse=True)
-def silence_logs():
-    logger.setLevel(logging.CRITICAL)
-
-
 def test_run_default_mkdocs_command():
     """
     Test the run_default_mkdocs_command function.
@@ -88,7 +81,7 @@ def test_get_plugin_config_return_none(load_config_output, expected_output):
         "include_stubs.cli.load_config",
         return_value=load_config_output,
     ):
-        get_plugin_config() == expected_output
+        assert get_plugin_config() == expected_output
 
 
 def test_get_plugin_config():
@@ -106,7 +99,7 @@ def test_get_plugin_config():
         "include_stubs.cli.load_config",
         return_value=load_config_output,
     ):
-        get_plugin_config() == config_value
+        assert get_plugin_config() == config_value
 
 
 @pytest.mark.parametrize(
@@ -412,7 +405,6 @@ def test_main(
     output_is_default_mkdocs_to_be_run,
     input_branch,
     plugin_config,
-    fp,
 ):
     """
     Test the main function.
@@ -425,7 +417,6 @@ def test_main(
     mock_is_default_mkdocs_to_be_run.return_value = output_is_default_mkdocs_to_be_run
     mock_return_git_clone_command = ["git", "clone", "command"]
     mock_get_git_clone_command.return_value = mock_return_git_clone_command
-    fp.register(mock_return_git_clone_command)
     mock_get_plugin_config.return_value = plugin_config
     main()
     # Assertions
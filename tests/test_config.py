@@ -1,7 +1,10 @@
+from dataclasses import FrozenInstanceError
+
 import pytest
 
 from include_stubs.config import (
     set_default_stubs_nav_path,
+    GitRef,
     GitRefType,
 )
 
@@ -58,4 +61,13 @@ def test_git_ref_type(enum, expected_value, expected_repr):
     """Test the GitRefType enum."""
     _enum = getattr(GitRefType, enum)
     assert str(_enum) == expected_repr
-    assert _enum.value == expected_value
\ No newline at end of file
+    assert _enum.value == expected_value
+
+
+def test_git_ref():
+    """Test the GitRef dataclass is immutable and hashable."""
+    ref = GitRef(name="main", sha="abc123")
+    assert repr(ref) == "main (abc123)"
+    with pytest.raises(FrozenInstanceError):
+        ref.sha = "def456"
+    assert {ref, GitRef(name="main", sha="abc123")} == {ref}
@@ -0,0 +1,36 @@
+import pytest
+
+pytest.importorskip("pytest_codspeed")
+
+from include_stubs.config import SUPPORTED_FILE_FORMATS
+from include_stubs.utils import (
+    GitRef,
+    get_dest_uri_for_local_stub,
+    get_repo_from_url,
+    keep_unique_refs,
+)
+
+
+def test_bench_keep_unique_refs(benchmark):
+    """Benchmark the keep_unique_refs function on a large list of refs."""
+    refs = [GitRef(sha=str(i % 500), name=f"ref{i % 10}") for i in range(10_000)]
+    result = benchmark(keep_unique_refs, refs)
+    assert len(result) == 500
+
+
+def test_bench_get_repo_from_url(benchmark):
+    """Benchmark the get_repo_from_url function."""
+    result = benchmark(get_repo_from_url, "https://github.com/owner/repo/other/parts")
+    assert result == "owner/repo"
+
+
+def test_bench_get_dest_uri_for_local_stub(benchmark):
+    """Benchmark the get_dest_uri_for_local_stub function."""
+    result = benchmark(
+        get_dest_uri_for_local_stub,
+        "example_stub.html",
+        "parent/url",
+        True,
+        SUPPORTED_FILE_FORMATS,
+    )
+    assert result == "parent/url/example_stub/index.html"
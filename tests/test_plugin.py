@@ -1,23 +1,20 @@
 """Tests for `plugin.py` module."""
 
-import logging
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
 import pytest
+from mkdocs.livereload import LiveReloadServer
+from mkdocs.structure.files import File
+from mkdocs.structure.pages import Page
 
 from include_stubs.plugin import (
     ENV_VARIABLE_NAME,
     IncludeStubsPlugin,
-    logger,
 )
 from include_stubs.utils import GitRef, Stub
 
 
-@pytest.fixture(autouse=True)
-def silence_logs():
-    logger.setLevel(logging.CRITICAL)
-
-
 @pytest.fixture
 def create_plugin(mock_plugin_config):
     """Factory function to create the plugin with the prescribed configuration options."""
@@ -183,14 +180,19 @@ def test_get_git_refs_for_website(
         ]
 
 
-@pytest.mark.parametrize(
-    "env_variable_value",
-    ["1", ""],
+@pytest.fixture(
+    params=["1", ""],
     ids=[
         "local_stub_present",
         "local_stub_not_present",
     ],
 )
+def env_variable_value(request, monkeypatch):
+    """Set the ENV variable read by the plugin."""
+    monkeypatch.setenv(ENV_VARIABLE_NAME, request.param)
+    return request.param
+
+
 @pytest.mark.parametrize(
     "cached_stubs",
     [True, False],
@@ -209,7 +211,6 @@ def test_on_files(
     create_plugin,
     mock_files,
     create_mock_mkdocs_config,
-    monkeypatch,
     mock_stublist,
 ):
     """Test the on_files method."""
@@ -219,7 +220,7 @@ def test_on_files(
     files = [MagicMock()] * 4
     # Create a mock StubList instance
     stublist = mock_stublist(
-        stubs=[Stub(gitref=MagicMock(), file=f, page=MagicMock()) for f in files]
+        stubs=[Stub(gitref=MagicMock(), file=f, page=MagicMock(spec_set=Page)) for f in files]
     )
     stublist[2].is_remote = False  # Make one stub a local stub
     stublist.populate_remote_stubs = MagicMock()
@@ -227,14 +228,12 @@ def test_on_files(
     stublist.append_or_replace = MagicMock()
     # Create a mock cached StubList instance
     cached_stublist = mock_stublist(
-        stubs=[Stub(gitref=MagicMock(), file=f, page=MagicMock()) for f in files[:-1]]
+        stubs=[Stub(gitref=MagicMock(), file=f, page=MagicMock(spec_set=Page)) for f in files[:-1]]
     )
     cached_stublist[1].is_remote = False  # Make one stub a local stub
     cached_stublist.populate_remote_stubs = MagicMock()
     cached_stublist.populate_local_stub = MagicMock()
     cached_stublist.append_or_replace = MagicMock()
-    # Set the ENV variable
-    monkeypatch.setenv(ENV_VARIABLE_NAME, env_variable_value)
     # Set the return values of the mocks
     mock_Stublist.return_value = stublist
     mock_get_git_refs_for_website.return_value = [MagicMock()] * 2
@@ -280,11 +279,7 @@ def test_on_nav(
     mock_set_stubs_nav_path.return_value = stubs_nav_path
     # Create a mock plugin
     files = mock_files()
-    pages = [
-        MagicMock(title="B"),
-        MagicMock(title="A"),
-        MagicMock(title="C"),
-    ]
+    pages = [SimpleNamespace(title=title) for title in "BAC"]
     plugin = create_plugin(
         stubs_nav_path=stubs_nav_path,
         _cached_stubs=[
@@ -311,7 +306,6 @@ def test_on_nav(
             ),
         ],
     )
-    plugin.get_git_refs_for_website = MagicMock(return_value={"ref1", "ref2"})
     # Create a mock nav object
     nav = mock_navigation
     # Call the on_nav method
@@ -358,9 +352,9 @@ def test_on_serve(
 ):
     """Test the on_serve method."""
     plugin = create_plugin(_cached_stubs=mock_stublist(stubs=stubs))
-    plugin._cached_stubs[0].file = MagicMock()
+    plugin._cached_stubs[0].file = MagicMock(spec_set=File)
     plugin._cached_stubs[0].file.abs_src_path = "local/stub/abs/path"
-    server = MagicMock()
+    server = MagicMock(spec_set=LiveReloadServer)
     builder = MagicMock()
     plugin.on_serve(server, create_mock_mkdocs_config(), builder)
     # Check that the on_serve method was called with the correct arguments
@@ -1,13 +1,14 @@
-# fp is a fixture provided by pytest-subprocess.
-
-from subprocess import CalledProcessError, SubprocessError
-from unittest.mock import MagicMock, mock_open, patch
+import json
+import os
+from io import StringIO
+from subprocess import CalledProcessError, CompletedProcess, SubprocessError
+from types import SimpleNamespace
+from unittest.mock import MagicMock
 
 import pytest
-from requests import RequestException
 
+from include_stubs import utils
 from include_stubs.config import GitRef, GitRefType
-from include_stubs.plugin import SUPPORTED_FILE_FORMATS
 from include_stubs.utils import (
     Stub,
     GitHubApiRateLimitError,
@@ -19,6 +20,7 @@ from include_stubs.utils import (
     get_git_refs,
     get_html_title,
     get_md_title,
+    get_title_getter,
     get_remote_repo_from_local_repo,
     get_repo_from_input,
     get_repo_from_url,
@@ -34,7 +36,7 @@ from include_stubs.utils import (
 
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def graphql_query_string():
     return (
         'query { repository(owner: "example", name: "repo") {'
@@ -46,82 +48,106 @@ def graphql_query_string():
     )
 
 
-def test_run_command(fp):
+def test_run_command(monkeypatch):
     """Test the run_command function."""
     command = ["echo", "Hello, World!"]
-    fp.register(command, stdout="Hello, World!")
+    calls = []
+
+    def _run(args, **kwargs):
+        calls.append(args)
+        return CompletedProcess(args, returncode=0, stdout="Hello, World!\n")
+
+    monkeypatch.setattr(utils.subprocess, "run", _run)
     result = run_command(command)
     assert result == "Hello, World!"
-    assert command in fp.calls
+    assert calls == [command]
 
 
-@patch("include_stubs.utils.logger")
-def test_print_exe_version_executable_installed(mock_logger):
-    """Test the print_exe_version function when the executable is installed."""
-    exe = "random_example_executable"
-    with patch(
-        "include_stubs.utils.run_command", return_value="1.2.3"
-    ) as mock_run_command:
-        print_exe_version(exe)
-        mock_run_command.assert_called_once_with([exe, "--version"])
-        mock_logger.info.assert_called_once_with(f"'{exe}' version: 1.2.3")
+def test_run_command_error(monkeypatch):
+    """Test the run_command function when the command fails."""
+    command = ["false"]
+
+    def _run(args, **kwargs):
+        raise CalledProcessError(returncode=1, cmd=args, stderr="example_error\n")
+
+    monkeypatch.setattr(utils.subprocess, "run", _run)
+    with pytest.raises(SubprocessError) as excinfo:
+        run_command(command)
+    assert str(excinfo.value) == "Command 'false' failed with error: example_error"
 
 
-def test_print_exe_version_executable_not_installed(fp):
-    """Test the print_exe_version function when the executable is installed."""
+@pytest.mark.parametrize(
+    "returncode, raises_error",
+    [
+        pytest.param(0, False, id="executable_installed"),
+        pytest.param(1, True, id="executable_not_installed"),
+    ],
+)
+def test_print_exe_version(monkeypatch, cmd_registry, returncode, raises_error):
+    """Test the print_exe_version function."""
+    mock_logger = MagicMock()
+    monkeypatch.setattr(utils, "logger", mock_logger)
     exe = "random_example_executable"
-    fp.register([f"{exe}", "--version"], returncode=1)
-    with pytest.raises(EnvironmentError) as excinfo:
-        print_exe_version(exe)
+    cmd_registry.add([exe, "--version"], stdout="1.2.3", returncode=returncode)
+    if raises_error:
+        with pytest.raises(EnvironmentError) as excinfo:
+            print_exe_version(exe)
         assert (
             str(excinfo.value)
             == f"Failed to get '{exe}' version. Please ensure it is installed correctly."
         )
+        mock_logger.info.assert_not_called()
+    else:
+        print_exe_version(exe)
+        mock_logger.info.assert_called_once_with(f"'{exe}' version: 1.2.3")
+    assert cmd_registry.seen == {(exe, "--version")}
+
+
+GIT_REFS_CASES = (
+    pytest.param(
+        "sha1\trefs/heads/main\nsha2\trefs/tags/dev\nsha3\trefs/heads/example/branch1\nsha4\trefs/tags/example/tag^{}",
+        (
+            GitRef(sha="sha1", name="main"),
+            GitRef(sha="sha2", name="dev"),
+            GitRef(sha="sha3", name="example/branch1"),
+        ),
+        id="non-empty-command-output",
+    ),
+    pytest.param("", (), id="empty-command-output"),
+)
 
 
 @pytest.mark.parametrize(
     "ref_type, ref_flag",
     [
-        (GitRefType.BRANCH, ["--heads"]),  # ref_type_branch
-        (GitRefType.TAG, ["--tags"]),  # ref_type_tag
-        (GitRefType.ALL, ["--heads", "--tags"]),  # ref_type_all
+        pytest.param(GitRefType.BRANCH, ["--heads"], id="ref_type_branch"),
+        pytest.param(GitRefType.TAG, ["--tags"], id="ref_type_tag"),
+        pytest.param(GitRefType.ALL, ["--heads", "--tags"], id="ref_type_all"),
     ],
-    ids=["ref_type_branch", "ref_type_tag", "ref_type_all"],
 )
 @pytest.mark.parametrize(
     "command_output, expected_output",
-    [
-        (
-            "sha1\trefs/heads/main\nsha2\trefs/tags/dev\nsha3\trefs/heads/example/branch1\nsha4\trefs/tags/example/tag^{}",
-            [
-                GitRef(sha="sha1", name="main"),
-                GitRef(sha="sha2", name="dev"),
-                GitRef(sha="sha3", name="example/branch1"),
-            ],
-        ),  # non-empty-command-output
-        ("", []),  # empty-command-output
-    ],
-    ids=["non-empty-command-output", "empty-command-output"],
+    GIT_REFS_CASES,
 )
-@patch("include_stubs.utils.get_local_branch")
 def test_get_git_refs(
-    mock_get_local_branch,
-    fp,
+    monkeypatch,
+    cmd_registry,
     ref_type,
     ref_flag,
     command_output,
     expected_output,
 ):
     """Test the get_git_refs function."""
+    mock_get_local_branch = MagicMock()
+    monkeypatch.setattr(utils, "get_local_branch", mock_get_local_branch)
     repo = "example/repo"
     repo_url = f"https://github.com/{repo}"
     pattern = "random-pattern"
-    fp.register(
-        ["git", "ls-remote", *ref_flag, repo_url, pattern], stdout=command_output
-    )
+    command = ("git", "ls-remote", *ref_flag, repo_url, pattern)
+    cmd_registry.add(command, stdout=command_output)
     result = get_git_refs(repo, pattern, ref_type)
-    assert result == expected_output
-    assert ["git", "ls-remote", *ref_flag, repo_url, pattern] in fp.calls
+    assert result == list(expected_output)
+    assert command in cmd_registry.seen
     if command_output:
         mock_get_local_branch.assert_called_once()
 
@@ -129,15 +155,11 @@ def test_get_git_refs(
 @pytest.mark.parametrize(
     "command_output, expected_output",
     [
-        ("false", False),  # rate_limit_not_reached
-        ("true", True),  # rate_limit_reached
-    ],
-    ids=[
-        "rate_limit_not_reached",
-        "rate_limit_reached",
+        pytest.param("false", False, id="rate_limit_not_reached"),
+        pytest.param("true", True, id="rate_limit_reached"),
     ],
 )
-def test_gh_rate_limit_reached(fp, command_output, expected_output):
+def test_gh_rate_limit_reached(cmd_registry, command_output, expected_output):
     """Test the gh_rate_limit_reached function."""
     command = [
         "gh",
@@ -146,42 +168,39 @@ def test_gh_rate_limit_reached(fp, command_output, expected_output):
         "--jq",
         "[.resources.[] | .remaining] | any(. == 0)",
     ]
-    fp.register(command, stdout=command_output)
+    cmd_registry.add(command, stdout=command_output)
     result = gh_rate_limit_reached()
     assert result is expected_output
 
 
-def test_get_remote_repo(fp):
+def test_get_remote_repo(cmd_registry):
     """
     Test the get_remote_repo_from_local_repo function.
     """
     mock_stdout = "mock_output"
-    command = ["git", "remote", "get-url", "origin"]
-    fp.register(command, stdout=mock_stdout)
+    command = ("git", "remote", "get-url", "origin")
+    cmd_registry.add(command, stdout=mock_stdout)
     output = get_remote_repo_from_local_repo()
     assert output == mock_stdout
-    assert command in fp.calls
+    assert command in cmd_registry.seen
 
 
 @pytest.mark.parametrize(
     "repo_url, expected_output, raises_error",
     [
-        (
+        pytest.param(
             "https://github.com/ACCESS-NRI/access-hive.org.au/other/parts",
             "ACCESS-NRI/access-hive.org.au",
             False,
-        ),  # valid_github_url
-        (
+            id="valid_github_url",
+        ),
+        pytest.param(
             "git@github.com:ACCESS-NRI/access-hive.org.au.git/other:parts/",
             "ACCESS-NRI/access-hive.org.au",
             False,
-        ),  # valid_github_ssh
-        ("invalid/repo", None, True),  # invalid
-    ],
-    ids=[
-        "valid_github_url",
-        "valid_github_ssh",
-        "invalid",
+            id="valid_github_ssh",
+        ),
+        pytest.param("invalid/repo", None, True, id="invalid"),
     ],
 )
 def test_get_repo_from_url(repo_url, expected_output, raises_error):
@@ -191,301 +210,241 @@ def test_get_repo_from_url(repo_url, expected_output, raises_error):
     if raises_error:
         with pytest.raises(ValueError) as excinfo:
             get_repo_from_url(repo_url)
-            assert str(excinfo.value) == "Invalid GitHub repo URL: '{repo_url}'"
+        assert str(excinfo.value) == f"Invalid GitHub repo URL: '{repo_url}'"
     else:
         output = get_repo_from_url(repo_url)
         assert output == expected_output
 
 
+@pytest.fixture
+def repo_mocks(monkeypatch):
+    """
+    Replace get_remote_repo_from_local_repo and get_repo_from_url with mocks.
+
+    Returns:
+        A tuple (mock_get_remote_repo, mock_get_repo_from_url).
+    """
+    mock_get_remote_repo = MagicMock()
+    mock_get_repo_from_url = MagicMock()
+    monkeypatch.setattr(utils, "get_remote_repo_from_local_repo", mock_get_remote_repo)
+    monkeypatch.setattr(utils, "get_repo_from_url", mock_get_repo_from_url)
+    return mock_get_remote_repo, mock_get_repo_from_url
+
+
+REMOTE_REPO_URL = "https://github.com/example/repo"
+NO_INPUT_ERROR = (
+    "Cannot determine GitHub repository. No GitHub repository specified in the "
+    "plugin configuration and local directory is not a git repository."
+)
+
+
 @pytest.mark.parametrize(
-    "config_input, get_repo_from_url_output",
+    "config_input, get_repo_from_url_input, expected_output",
     [
-        (
+        pytest.param(
+            "https://github.com/OWNER/REPO/contents",
             "https://github.com/OWNER/REPO/contents",
             "OWNER/REPO",
-        ),  # valid_github_url
-        (
+            id="valid_github_url",
+        ),
+        pytest.param(
+            "git@github.com:example/name.git/other_part:example",
             "git@github.com:example/name.git/other_part:example",
             "example/name",
-        ),  # valid_github_ssh_url
-    ],
-    ids=[
-        "valid_github_url",
-        "valid_github_ssh_url",
+            id="valid_github_ssh_url",
+        ),
+        pytest.param("owner-example/repo_name", None, "owner-example/repo_name", id="repo"),
+        pytest.param("", REMOTE_REPO_URL, "example/repo", id="empty"),
+        pytest.param(None, REMOTE_REPO_URL, "example/repo", id="none"),
     ],
 )
-def test_get_repo_from_input_url_input(config_input, get_repo_from_url_output):
-    """Test the get_repo_from_input function."""
-    with (
-        patch(
-            "include_stubs.utils.get_remote_repo_from_local_repo"
-        ) as mock_get_remote_repo,
-        patch(
-            "include_stubs.utils.get_repo_from_url",
-            return_value=get_repo_from_url_output,
-        ) as mock_get_repo_from_url,
-    ):
-        output = get_repo_from_input(config_input)
-        assert output == get_repo_from_url_output
-        mock_get_remote_repo.assert_not_called()
-        mock_get_repo_from_url.assert_called_with(config_input)
-
-
-def test_get_repo_from_input_repo_input():
-    """
-    Test the get_repo_from_input function when the input is in the 'OWNER/REPO' format.
-    """
-    config_input = "owner-example/repo_name"
-    with (
-        patch(
-            "include_stubs.utils.get_remote_repo_from_local_repo"
-        ) as mock_get_remote_repo,
-        patch("include_stubs.utils.get_repo_from_url") as mock_get_repo_from_url,
-    ):
-        output = get_repo_from_input(config_input)
-        assert output == config_input
-        mock_get_remote_repo.assert_not_called()
+def test_get_repo_from_input(
+    repo_mocks, config_input, get_repo_from_url_input, expected_output
+):
+    """
+    Test the get_repo_from_input function.
+    The local remote repo is only looked up when no input is given, and
+    get_repo_from_url is only called when there is a URL to parse.
+    """
+    mock_get_remote_repo, mock_get_repo_from_url = repo_mocks
+    mock_get_remote_repo.return_value = REMOTE_REPO_URL
+    mock_get_repo_from_url.return_value = expected_output
+    output = get_repo_from_input(config_input)
+    assert output == expected_output
+    assert mock_get_remote_repo.called is not bool(config_input)
+    if get_repo_from_url_input is None:
         mock_get_repo_from_url.assert_not_called()
+    else:
+        mock_get_repo_from_url.assert_called_once_with(get_repo_from_url_input)
 
 
 @pytest.mark.parametrize(
-    "config_input",
-    ["www.example.com/owner/repo", "invalid_repo_name", "invalid/repo/name"],
-    ids=[
-        "not_a_github_url",
-        "no_slash",
-        "multiple_slashes",
+    "config_input, expected_error",
+    [
+        pytest.param(
+            "www.example.com/owner/repo",
+            "Invalid GitHub repo: 'www.example.com/owner/repo'",
+            id="not_a_github_url",
+        ),
+        pytest.param(
+            "invalid_repo_name",
+            "Invalid GitHub repo: 'invalid_repo_name'",
+            id="no_slash",
+        ),
+        pytest.param(
+            "invalid/repo/name",
+            "Invalid GitHub repo: 'invalid/repo/name'",
+            id="multiple_slashes",
+        ),
+        pytest.param(
+            "in.valid/repo",
+            "Invalid GitHub repo: 'in.valid/repo'",
+            id="dotted_owner",
+        ),
+        pytest.param("", NO_INPUT_ERROR, id="empty_no_local_repo"),
+        pytest.param(None, NO_INPUT_ERROR, id="none_no_local_repo"),
     ],
 )
-def test_get_repo_from_input_repo_input_invalid(config_input):
+def test_get_repo_from_input_error(repo_mocks, config_input, expected_error):
     """
-    Test the get_repo_from_input function when the input is invalid.
+    Test the get_repo_from_input function when the input is invalid, or when
+    no input is given and get_remote_repo_from_local_repo raises an exception.
     """
-    with (
-        patch(
-            "include_stubs.utils.get_remote_repo_from_local_repo"
-        ) as mock_get_remote_repo,
-        patch("include_stubs.utils.get_repo_from_url") as mock_get_repo_from_url,
-        pytest.raises(ValueError) as excinfo,
-    ):
+    mock_get_remote_repo, mock_get_repo_from_url = repo_mocks
+    mock_get_remote_repo.side_effect = SubprocessError
+    with pytest.raises(ValueError) as excinfo:
         get_repo_from_input(config_input)
-        assert str(excinfo.value) == f"Invalid GitHub repo: '{config_input}'"
-        mock_get_remote_repo.assert_not_called()
-        mock_get_repo_from_url.assert_not_called()
-
-
-@pytest.mark.parametrize(
-    "config_input",
-    ["", None],
-    ids=["empty", "none"],
-)
-def test_get_repo_from_input_no_input(config_input):
-    """
-    Test the get_repo_from_input function when the input is None or empty.
-    """
-    get_remote_repo_output = "https://github.com/example/repo"
-    get_repo_from_url_output = "example/repo"
-    with (
-        patch(
-            "include_stubs.utils.get_remote_repo_from_local_repo",
-            return_value=get_remote_repo_output,
-        ) as mock_get_remote_repo,
-        patch(
-            "include_stubs.utils.get_repo_from_url",
-            return_value=get_repo_from_url_output,
-        ) as mock_get_repo_from_url,
-    ):
-        output = get_repo_from_input(config_input)
-        assert output == get_repo_from_url_output
-        mock_get_remote_repo.assert_called()
-        mock_get_repo_from_url.assert_called_with(get_remote_repo_output)
+    assert str(excinfo.value) == expected_error
+    assert mock_get_remote_repo.called is not bool(config_input)
+    mock_get_repo_from_url.assert_not_called()
 
 
 @pytest.mark.parametrize(
-    "config_input",
-    ["", None],
-    ids=["empty", "none"],
-)
-def test_get_repo_from_input_no_input_error(config_input):
-    """
-    Test the get_repo_from_input function when the input is None or empty
-    and get_remote_repo_from_local_repo raises an exception.
-    """
-    with (
-        patch(
-            "include_stubs.utils.get_remote_repo_from_local_repo",
-            side_effect=SubprocessError(),
-        ) as mock_get_remote_repo,
-        patch("include_stubs.utils.get_repo_from_url") as mock_get_repo_from_url,
-        pytest.raises(ValueError) as excinfo,
-    ):
-        get_repo_from_input(config_input)
-        assert (
-            str(excinfo.value)
-            == "Cannot determine GitHub repository. No GitHub repository specified in the plugin configuration and local directory is not a git repository."
-        )
-        mock_get_remote_repo.assert_called()
-        mock_get_repo_from_url.assert_not_called()
-
-
-@pytest.mark.parametrize(
-    "main_branch_config_input, local_branch, remote_owner_name, expected_output",
+    "main_branch_config_input, local_branch, local_branch_returncode, remote_repo_error, remote_owner_name, expected_output",
     [
-        ("branch", "branch", "example/repo", True),  # true
-        ("main_branch", "not_main_branch", "example/repo", False),  # not_main_branch
-        ("branch", "branch", "example/different_repo", False),  # not_main_repo
-        (None, "default", "example/repo", True),  # none_branch_true
-        (None, "default", "example/different_repo", False),  # none_branch_false
-    ],
-    ids=[
-        "true",
-        "not_main_branch",
-        "not_main_repo",
-        "none_branch_true",
-        "none_branch_false",
+        pytest.param("branch", "branch", 0, False, "example/repo", True, id="true"),
+        pytest.param("main_branch", "not_main_branch", 0, False, "example/repo", False, id="not_main_branch"),
+        pytest.param("branch", "branch", 0, False, "example/different_repo", False, id="not_main_repo"),
+        pytest.param(None, "default", 0, False, "example/repo", True, id="none_branch_true"),
+        pytest.param(None, "default", 0, False, "example/different_repo", False, id="none_branch_false"),
+        pytest.param("branch", "branch", 0, True, "example/repo", False, id="get_remote_repo_exception"),
+        pytest.param("branch", "branch", 1, False, "example/repo", False, id="command_exception"),
     ],
 )
-@patch(
-    "include_stubs.utils.get_default_branch_from_remote_repo",
-    return_value="default",
-)
-@patch("include_stubs.utils.get_local_branch")
 def test_is_main_website(
-    mock_get_local_branch,
-    mock_get_default_branch_from_remote_repo,
+    monkeypatch,
+    repo_mocks,
+    cmd_registry,
     main_branch_config_input,
     local_branch,
+    local_branch_returncode,
+    remote_repo_error,
     remote_owner_name,
     expected_output,
 ):
     """
     Test the is_main_website function.
     """
-    repo = "example/repo"
-    mock_get_local_branch.return_value = local_branch
-    with (
-        patch(
-            "include_stubs.utils.get_remote_repo_from_local_repo",
-            return_value=remote_owner_name,
-        ) as mock_get_remote_repo,
-        patch(
-            "include_stubs.utils.get_repo_from_url",
-            return_value=remote_owner_name,
-        ) as mock_get_repo_from_url,
-    ):
-        output = is_main_website(main_branch_config_input, repo)
-        assert output is expected_output
-        mock_get_remote_repo.assert_called()
-        mock_get_repo_from_url.assert_called()
-
-
-def test_is_main_website_get_remote_repo_exception(fp):
-    """
-    Test the is_main_website function when the get_remote_repo_from_local_repo raises an exception.
-    """
-    main_branch_config_input = "test"
-    repo = "another_example/name"
-    command = ["git", "rev-parse", "--abbrev-ref", "HEAD"]
-    fp.register(command, stdout="example_command_output")
-    with (
-        patch(
-            "include_stubs.utils.get_remote_repo_from_local_repo",
-            side_effect=CalledProcessError(
-                returncode=1, cmd="example", stderr="example_error"
-            ),
-        ) as mock_get_remote_repo,
-        patch(
-            "include_stubs.utils.get_repo_from_url",
-        ) as mock_get_repo_from_url,
-    ):
-        output = is_main_website(main_branch_config_input, repo)
-        assert output is False
-        mock_get_remote_repo.assert_called()
-        mock_get_repo_from_url.assert_not_called()
-
-
-def test_is_main_website_command_exception(fp):
-    """
-    Test the is_main_website function when the 'git rev-parse --abbrev-ref HEAD' command raises an exception.
-    """
-    main_branch_config_input = "test"
-    repo = "another_example/name"
-    command = ["git", "rev-parse", "--abbrev-ref", "HEAD"]
-    fp.register(command, stdout="example_command_output", returncode=1)
-    with (
-        patch(
-            "include_stubs.utils.get_remote_repo_from_local_repo",
-        ) as mock_get_remote_repo,
-        patch(
-            "include_stubs.utils.get_repo_from_url",
-        ) as mock_get_repo_from_url,
-    ):
-        output = is_main_website(main_branch_config_input, repo)
-        assert output is False
-        mock_get_remote_repo.assert_called()
+    mock_get_remote_repo, mock_get_repo_from_url = repo_mocks
+    monkeypatch.setattr(
+        utils, "get_default_branch_from_remote_repo", lambda remote_repo: "default"
+    )
+    cmd_registry.add(
+        ["git", "rev-parse", "--abbrev-ref", "HEAD"],
+        stdout=local_branch,
+        returncode=local_branch_returncode,
+    )
+    if remote_repo_error:
+        mock_get_remote_repo.side_effect = SubprocessError
+    mock_get_repo_from_url.return_value = remote_owner_name
+    output = is_main_website(main_branch_config_input, "example/repo")
+    assert output is expected_output
+    mock_get_remote_repo.assert_called()
+    if remote_repo_error or local_branch_returncode:
         mock_get_repo_from_url.assert_not_called()
+    else:
+        mock_get_repo_from_url.assert_called_once_with(mock_get_remote_repo.return_value)
 
 
-def test_append_number_to_file_name():
+@pytest.mark.parametrize(
+    "filename, expected_output",
+    [
+        pytest.param("example.extension", "example31.extension", id="extension"),
+        pytest.param("example", "example31", id="no_extension"),
+        pytest.param("some.dir/example", "some.dir/example31", id="dotted_directory"),
+        pytest.param("some/.example", "some/.example31", id="hidden_file"),
+        pytest.param("some/..example.md", "some/..example31.md", id="hidden_file_extension"),
+    ],
+)
+def test_append_number_to_file_name(filename, expected_output):
     """
     Test the append_number_to_file_name function.
     """
-    filename = "example.extension"
-    number = 31
-    expected_output = "example31.extension"
-    output = append_number_to_file_name(filename, number)
+    output = append_number_to_file_name(filename, 31)
     assert output == expected_output
 
 
+@pytest.fixture(scope="module")
+def existing_files():
+    """Files already present in the site, shared by all the make_file_unique cases."""
+    return [
+        SimpleNamespace(src_path="src_path", dest_path="dest_path/index.html"),
+        SimpleNamespace(src_path="src_path1", dest_path="dest_path2/index.html"),
+        SimpleNamespace(src_path="src_path3", dest_path="other_dest_path/index.html"),
+    ]
+
+
+MAKE_FILE_UNIQUE_CASES = (
+    pytest.param(
+        "other",
+        "something/index.html",
+        True,
+        "other",
+        "something/index.html",
+        id="unique",
+    ),
+    pytest.param(
+        "src_path",
+        "other_dest/index.html",
+        True,
+        "src_path2",
+        "other_dest2/index.html",
+        id="same_src_path",
+    ),
+    pytest.param(
+        "other_src",
+        "dest_path/index.html",
+        True,
+        "other_src1",
+        "dest_path1/index.html",
+        id="same_dest_path",
+    ),
+    pytest.param(
+        "src_path",
+        "dest_path/index.html",
+        True,
+        "src_path4",
+        "dest_path4/index.html",
+        id="same_src_path_and_dest_path",
+    ),
+    pytest.param(
+        "src_path",
+        "other_dest/index.html",
+        False,
+        "src_path2",
+        "other_dest/index2.html",
+        id="use_directory_urls_false",
+    ),
+)
+
+
 @pytest.mark.parametrize(
     "input_src_path, input_dest_path, use_directory_urls, expected_output_src_path, expected_output_dest_path",
-    [
-        (
-            "other",
-            "something/index.html",
-            True,
-            "other",
-            "something/index.html",
-        ),  # unique
-        (
-            "src_path",
-            "other_dest/index.html",
-            True,
-            "src_path2",
-            "other_dest2/index.html",
-        ),  # same src_path
-        (
-            "other_src",
-            "dest_path/index.html",
-            True,
-            "other_src1",
-            "dest_path1/index.html",
-        ),  # same dest_path
-        (
-            "src_path",
-            "dest_path/index.html",
-            True,
-            "src_path4",
-            "dest_path4/index.html",
-        ),  # same src_path and dest_path
-        (
-            "src_path",
-            "other_dest/index.html",
-            False,
-            "src_path2",
-            "other_dest/index2.html",
-        ),  # use_directory_urls_false
-    ],
-    ids=[
-        "unique",
-        "same_src_path",
-        "same_dest_path",
-        "same_src_path_and_dest_path",
-        "use_directory_urls_false",
-    ],
+    MAKE_FILE_UNIQUE_CASES,
 )
 def test_make_file_unique(
     mock_files,
+    existing_files,
     input_src_path,
     input_dest_path,
     use_directory_urls,
@@ -493,52 +452,44 @@ def test_make_file_unique(
     expected_output_dest_path,
 ):
     """Test the make_file_unique function."""
-    file = MagicMock(
+    file = SimpleNamespace(
         src_path=input_src_path,
         dest_path=input_dest_path,
         use_directory_urls=use_directory_urls,
     )
-    files = mock_files(
-        [
-            MagicMock(src_path="src_path", dest_path="dest_path/index.html"),
-            MagicMock(src_path="src_path1", dest_path="dest_path2/index.html"),
-            MagicMock(src_path="src_path3", dest_path="other_dest_path/index.html"),
-        ]
-    )
+    # Copy the shared list, so that changes to the Files mock do not leak between cases
+    files = mock_files(list(existing_files))
     make_file_unique(file, files)
     assert file.src_path == expected_output_src_path
     assert file.dest_path == expected_output_dest_path
 
 
-@pytest.mark.parametrize(
-    "content, expected_output",
-    [
-        (
-            "<html><body><h1>Example Title</h1></body></html>",
-            "Example Title",
-        ),  # one_title
-        (
-            "<html><body><h1>Example <b>Title</b></h1></body></html>",
-            "Example Title",
-        ),  # special_characters
-        (
-            "<html><body><h1>First Title</h1><h1>Second Title</h1></body></html>",
-            "First Title",
-        ),  # multiple_titles
-        ("<html><body><h2>First Title</h2></body></html>", None),  # no_title
-        (
-            "<html><body><!-- <h1>First Title</h1> --></body></html>",
-            None,
-        ),  # commented_title
-    ],
-    ids=[
-        "one_title",
-        "special_characters",
-        "multiple_titles",
-        "no_title",
-        "commented_title",
-    ],
+HTML_TITLE_CASES = (
+    pytest.param(
+        "<html><body><h1>Example Title</h1></body></html>",
+        "Example Title",
+        id="one_title",
+    ),
+    pytest.param(
+        "<html><body><h1>Example <b>Title</b></h1></body></html>",
+        "Example Title",
+        id="special_characters",
+    ),
+    pytest.param(
+        "<html><body><h1>First Title</h1><h1>Second Title</h1></body></html>",
+        "First Title",
+        id="multiple_titles",
+    ),
+    pytest.param("<html><body><h2>First Title</h2></body></html>", None, id="no_title"),
+    pytest.param(
+        "<html><body><!-- <h1>First Title</h1> --></body></html>",
+        None,
+        id="commented_title",
+    ),
 )
+
+
+@pytest.mark.parametrize("content, expected_output", HTML_TITLE_CASES)
 def test_get_html_title(content, expected_output):
     """
     Test the get_html_title function.
@@ -546,26 +497,20 @@ def test_get_html_title(content, expected_output):
     assert get_html_title(content) == expected_output
 
 
-@pytest.mark.parametrize(
-    "content, expected_output",
-    [
-        ("# Example Title \n Other text", "Example Title"),  # one_title
-        ("# Example `Title` \n Other text", "Example Title"),  # special_characters
-        (
-            "# First Title \n Other text \n # Other title",
-            "First Title",
-        ),  # multiple_titles
-        ("## No title \n Other text", None),  # no_title
-        ("<!--  # Title --> \n Text", None),  # commented_title
-    ],
-    ids=[
-        "one_title",
-        "special_characters",
-        "multiple_titles",
-        "no_title",
-        "commented_title",
-    ],
+MD_TITLE_CASES = (
+    pytest.param("# Example Title \n Other text", "Example Title", id="one_title"),
+    pytest.param("# Example `Title` \n Other text", "Example Title", id="special_characters"),
+    pytest.param(
+        "# First Title \n Other text \n # Other title",
+        "First Title",
+        id="multiple_titles",
+    ),
+    pytest.param("## No title \n Other text", None, id="no_title"),
+    pytest.param("<!--  # Title --> \n Text", None, id="commented_title"),
 )
+
+
+@pytest.mark.parametrize("content, expected_output", MD_TITLE_CASES)
 def test_get_md_title(content, expected_output):
     """
     Test the get_md_title function.
@@ -573,25 +518,52 @@ def test_get_md_title(content, expected_output):
     assert get_md_title(content) == expected_output
 
 
+def test_get_md_title_parser_reset():
+    """
+    Test the get_md_title function does not carry state over between calls.
+    """
+    assert get_md_title("# Example Title") == "Example Title"
+    assert get_md_title("No title") is None
+
+
+@pytest.mark.parametrize(
+    "fname, expected_output",
+    [
+        pytest.param("some/stub.html", get_html_title, id="html"),
+        pytest.param("some/stub.md", get_md_title, id="md"),
+        pytest.param("some/stub.txt", get_md_title, id="other_format"),
+        pytest.param("stub", get_md_title, id="no_extension"),
+        # As with os.path.splitext, a leading dot does not start an extension
+        pytest.param(".html", get_md_title, id="dotfile"),
+    ],
+)
+def test_get_title_getter(fname, expected_output):
+    """
+    Test the get_title_getter function.
+    """
+    assert get_title_getter(fname) is expected_output
+
+
 @pytest.mark.parametrize(
     "path, expected_output",
     [
-        (
+        pytest.param(
             "> Some random / Path /For/Navigation/ >>",
             "> Some random / Path /For/Navigation/ >>",
-        ),  # string
-        ("", ""),  # empty
-        ("    ", "    "),  # blank
-        (None, "default_output"),  # none
+            id="string",
+        ),
+        pytest.param("", "", id="empty"),
+        pytest.param("    ", "    ", id="blank"),
+        pytest.param(None, "default_output", id="none"),
     ],
-    ids=["string", "empty", "blank", "none"],
 )
-@patch("include_stubs.utils.set_default_stubs_nav_path")
-def test_set_stubs_nav_path(mock_set_default_stubs_nav_path, path, expected_output):
+def test_set_stubs_nav_path(monkeypatch, path, expected_output):
     """
     Test the set_stubs_nav_path function.
     """
-    mock_set_default_stubs_nav_path.return_value = "default_output"
+    monkeypatch.setattr(
+        utils, "set_default_stubs_nav_path", lambda stubs_parent_url: "default_output"
+    )
     assert set_stubs_nav_path(path, "stub") == expected_output
 
 
@@ -625,7 +597,7 @@ def test_add_pages_to_nav_no_section_creation(mock_navigation):
     """
     Test the add_pages_to_nav function when all the subsections are present.
     """
-    pages = [MagicMock(), MagicMock()]
+    pages = [SimpleNamespace(parent=None) for _ in range(2)]
     nav = mock_navigation
     nav_titles = ["Root", "Subsection"]
     add_pages_to_nav(nav, pages, nav_titles)
@@ -643,7 +615,7 @@ def test_add_pages_to_nav_section_created(mock_navigation):
     """
     Test the add_pages_to_nav function when the section needs to be created.
     """
-    pages = [MagicMock(), MagicMock()]
+    pages = [SimpleNamespace(parent=None) for _ in range(2)]
     nav = mock_navigation
     nav_titles = ["Root", "New Section"]
     add_pages_to_nav(nav, pages, nav_titles)
@@ -662,123 +634,140 @@ def test_add_pages_to_nav_root(mock_navigation):
     """
     Test the add_pages_to_nav function when the pages are added to the root navigation.
     """
-    pages = [MagicMock(), MagicMock()]
+    pages = [SimpleNamespace(parent=None) for _ in range(2)]
     nav = mock_navigation
     nav_titles = [""]
     add_pages_to_nav(nav, pages, nav_titles)
     assert len(nav.items) == 3
     assert nav.items[0].title == "Root"
     assert nav.items[-2:] == pages
+    # Pages added to the root navigation have no parent
     for page in pages:
-        assert isinstance(page.parent, MagicMock)
+        assert page.parent is None
+
+
+DEFAULT_BRANCH_REPO = "owner/repo"
+DEFAULT_BRANCH_COMMAND = (
+    "gh",
+    "api",
+    f"repos/{DEFAULT_BRANCH_REPO}",
+    "--jq",
+    ".default_branch",
+)
 
 
 def test_get_default_branch_from_remote_repo_valid(
-    fp,
+    cmd_registry,
 ):
     """
     Test the get_default_branch_from_remote_repo function when the command is successful.
     """
-    remote_repo = "owner/repo"
-    api_url = f"repos/{remote_repo}"
-    command = ["gh", "api", api_url, "--jq", ".default_branch"]
-    fp.register(command, stdout="default")
-    assert get_default_branch_from_remote_repo(remote_repo) == "default"
+    cmd_registry.add(DEFAULT_BRANCH_COMMAND, stdout="default")
+    assert get_default_branch_from_remote_repo(DEFAULT_BRANCH_REPO) == "default"
+
+
+@pytest.fixture
+def mock_gh_rate_limit_reached(request, monkeypatch):
+    """
+    Replace gh_rate_limit_reached with a mock returning False,
+    or the value given through indirect parametrization.
+
+    Returns:
+        The mock, whose return_value can be changed by the test.
+    """
+    mock = MagicMock(return_value=getattr(request, "param", False))
+    monkeypatch.setattr(utils, "gh_rate_limit_reached", mock)
+    return mock
 
 
 @pytest.mark.parametrize(
-    "gh_rate_limit_reached",
-    [True, False],
-    ids=["gh_api_rate_limit_reached", "gh_api_rate_limit_not_reached"],
+    "mock_gh_rate_limit_reached",
+    [
+        pytest.param(True, id="gh_api_rate_limit_reached"),
+        pytest.param(False, id="gh_api_rate_limit_not_reached"),
+    ],
+    indirect=True,
 )
 def test_get_default_branch_from_remote_repo_error(
-    gh_rate_limit_reached,
-    fp,
+    cmd_registry,
+    mock_gh_rate_limit_reached,
 ):
     """
     Test the get_default_branch_from_remote_repo function when the command is not successful.
     """
-    remote_repo = "owner/repo"
-    api_url = f"repos/{remote_repo}"
-    command = ["gh", "api", api_url, "--jq", ".default_branch"]
-    fp.register(command, returncode=1)
-    exception_class = GitHubApiRateLimitError if gh_rate_limit_reached else ValueError
-    with (
-        patch(
-            "include_stubs.utils.gh_rate_limit_reached",
-            return_value=gh_rate_limit_reached,
-        ),
-        pytest.raises(exception_class),
-    ):
-        get_default_branch_from_remote_repo(remote_repo)
+    cmd_registry.add(DEFAULT_BRANCH_COMMAND, returncode=1)
+    if mock_gh_rate_limit_reached.return_value:
+        exception_class = GitHubApiRateLimitError
+    else:
+        exception_class = ValueError
+    with pytest.raises(exception_class):
+        get_default_branch_from_remote_repo(DEFAULT_BRANCH_REPO)
+
+
+DEST_URI_CASES = (
+    pytest.param(True, "parent/url/example_stub/index.html", id="use_directory_urls_true"),
+    pytest.param(False, "parent/url/example_stub", id="use_directory_urls_false"),
+)
 
 
 @pytest.mark.parametrize(
     "use_directory_urls, expected_output",
-    [
-        (True, "parent/url/example_stub/index.html"),  # use_directory_urls_true
-        (False, "parent/url/example_stub"),  # use_directory_urls_false
-    ],
-    ids=[
-        "use_directory_urls_true",
-        "use_directory_urls_false",
-    ],
+    DEST_URI_CASES,
 )
-def test_get_dest_uri_for_local_stub(use_directory_urls, expected_output):
+def test_get_dest_uri_for_local_stub(
+    use_directory_urls, expected_output, supported_file_formats
+):
     """
     Test the get_dest_uri_for_local_stub function.
     """
     stub_fname = "example_stub.md"
     stubs_parent_url = "parent/url"
     output = get_dest_uri_for_local_stub(
-        stub_fname, stubs_parent_url, use_directory_urls, SUPPORTED_FILE_FORMATS
+        stub_fname, stubs_parent_url, use_directory_urls, supported_file_formats
     )
     assert output == expected_output
 
 
+KEEP_UNIQUE_REFS_INPUT = (
+    GitRef(sha="123", name="ref1"),
+    GitRef(sha="456", name="ref2"),
+    GitRef(sha="123", name="ref4"),  # duplicate
+    GitRef(sha="231", name="ref1"),
+    GitRef(sha="456", name="ref1"),  # duplicate
+    GitRef(sha="431", name="ref1"),
+)
+
+
 def test_keep_unique_refs():
     """
     Test the keep_unique_refs function.
     """
-    refs = [
-        GitRef(sha="123", name="ref1"),
-        GitRef(sha="456", name="ref2"),
-        GitRef(sha="123", name="ref4"),  # duplicate
-        GitRef(sha="231", name="ref1"),
-        GitRef(sha="456", name="ref1"),  # duplicate
-        GitRef(sha="431", name="ref1"),
-    ]
-    expected = [
-        GitRef(sha="123", name="ref1"),
-        GitRef(sha="456", name="ref2"),
-        GitRef(sha="231", name="ref1"),
-        GitRef(sha="431", name="ref1"),
-    ]
+    result = keep_unique_refs(KEEP_UNIQUE_REFS_INPUT)
+    # The first appearance of each SHA is kept, as the same object
+    expected = [KEEP_UNIQUE_REFS_INPUT[i] for i in (0, 1, 3, 5)]
+    assert len(result) == len(expected)
+    assert all(ref is expected_ref for ref, expected_ref in zip(result, expected))
+
+
+def test_keep_unique_refs_many_refs():
+    """
+    Test the keep_unique_refs function with many refs sharing the same shas.
+    """
+    refs = [GitRef(sha=str(i % 500), name=f"ref{i % 7}") for i in range(10_000)]
     result = keep_unique_refs(refs)
-    assert result == expected
+    assert result == refs[:500]
+
+
+GET_UNIQUE_STUB_FNAME_CASES = (
+    pytest.param(("f.ext1", "f.txt", "f"), "f.ext1", id="one supported file"),
+    pytest.param(("f.ext", "f.txt", "f"), None, id="no supported files"),
+    pytest.param(("f.ext1", "f.ext2", "f"), None, id="multiple supported files"),
+)
 
 
 @pytest.mark.parametrize(
     "filenames, expected_output",
-    [
-        (
-            ["f.ext1", "f.txt", "f"],
-            "f.ext1",
-        ),
-        (
-            ["f.ext", "f.txt", "f"],
-            None,
-        ),
-        (
-            ["f.ext1", "f.ext2", "f"],
-            None,
-        ),
-    ],
-    ids=[
-        "one supported file",
-        "no supported files",
-        "multiple supported files",
-    ],
+    GET_UNIQUE_STUB_FNAME_CASES,
 )
 def test_get_unique_stub_fname(filenames, expected_output):
     """
@@ -820,10 +809,9 @@ def test_StubList_local_stub(mock_stublist):
 
 @pytest.mark.parametrize(
     "local_stub_present",
-    [True, False],
-    ids=[
-        "with_local_stub",
-        "no_local_stub",
+    [
+        pytest.param(True, id="with_local_stub"),
+        pytest.param(False, id="no_local_stub"),
     ],
 )
 def test_StubList_append_or_replace(mock_stublist, local_stub_present):
@@ -851,156 +839,214 @@ def test_StubList_get_graphql_query_string(graphql_query_string, mock_stublist):
     assert output == graphql_query_string
 
 
-@patch(
-    "include_stubs.utils.StubList._get_graphql_query_string",
-    return_value=graphql_query_string,
-)
-@patch("include_stubs.utils.gh_rate_limit_reached")
-@patch("include_stubs.utils.json.loads")
-@patch("include_stubs.utils.get_unique_stub_fname")
+def test_StubList_get_graphql_contents_query_string(mock_stublist):
+    """
+    Test StubList's _get_graphql_contents_query_string method.
+    """
+    stublist = mock_stublist()
+    for stub in stublist.remote_stubs:
+        stub.fname = f"{stub.gitref.name}.md"
+    output = stublist._get_graphql_contents_query_string()
+    assert output == (
+        'query { repository(owner: "example", name: "repo") {'
+        'r_abc123: object(expression: "abc123:stub/path/main.md") { ... on Blob { text isTruncated }}'
+        'r_def456: object(expression: "def456:stub/path/dev.md") { ... on Blob { text isTruncated }}'
+        'r_123456: object(expression: "123456:stub/path/other.md") { ... on Blob { text isTruncated }}'
+        'r_345678: object(expression: "345678:stub/path/other2.md") { ... on Blob { text isTruncated }}'
+        "}}"
+    )
+
+
+def test_StubList_get_graphql_contents_query_string_escaped(mock_stublist):
+    """
+    Test StubList's _get_graphql_contents_query_string method escapes quotes
+    and backslashes in the stub path.
+    """
+    stublist = mock_stublist(stubs=[Stub(gitref=GitRef(name="main", sha="abc123"))])
+    stublist[0].fname = 'we"ird\\name.md'
+    output = stublist._get_graphql_contents_query_string()
+    assert output == (
+        'query { repository(owner: "example", name: "repo") {'
+        'r_abc123: object(expression: "abc123:stub/path/we\\"ird\\\\name.md") '
+        "{ ... on Blob { text isTruncated }}"
+        "}}"
+    )
+
+
+@pytest.fixture
+def mock_get_graphql_query_string(monkeypatch):
+    """
+    Replace StubList's _get_graphql_query_string method with a mock.
+
+    Returns:
+        The mock, returning a fixed query string.
+    """
+    mock = MagicMock(return_value="example_query")
+    monkeypatch.setattr(utils.StubList, "_get_graphql_query_string", mock)
+    return mock
+
+
+@pytest.fixture
+def graphql_command(mock_get_graphql_query_string):
+    """The gh command run to query the remote stub file names."""
+    query_string = mock_get_graphql_query_string.return_value
+    return ("gh", "api", "graphql", "-f", f"query={query_string}")
+
+
 def test_StubList_populate_remote_stub_fnames(
-    mock_get_unique_stub_fname,
-    mock_json_loads,
+    graphql_command,
     mock_gh_rate_limit_reached,
-    mock_get_graphql_query_string,
-    fp,
+    cmd_registry,
     mock_stublist,
 ):
     """
     Test StubList's _populate_remote_stub_fnames method.
     """
     stublist = mock_stublist()
-    command = [
-        "gh",
-        "api",
-        "graphql",
-        "-f",
-        f"query={mock_get_graphql_query_string.return_value}",
-    ]
-    fp.register(command)
-    mock_json_loads.return_value = {
+    graphql_output = {
         "data": {
             "repository": {
-                "r_abc123": MagicMock(),
+                # Unique stub
+                "r_abc123": {"entries": [{"name": "file1.ext1"}]},
+                # Missing stubs directory
                 "r_def456": None,
-                "r_123456": MagicMock(),
-                "r_345678": MagicMock(),
+                # Unique stub among other files
+                "r_123456": {"entries": [{"name": "file2.ext2"}, {"name": "README"}]},
+                # Multiple conflicting stubs
+                "r_345678": {"entries": [{"name": "a.ext1"}, {"name": "b.ext2"}]},
             }
         }
     }
-    # We set the side_effect to return different values on each call.
-    # We return a valid filename on the first and second call, None on the third call.
-    mock_get_unique_stub_fname.side_effect = ["file1", "file2", None]
+    cmd_registry.add(graphql_command, stdout=json.dumps(graphql_output))
     stublist._populate_remote_stub_fnames()
     mock_gh_rate_limit_reached.assert_not_called()
-    assert len(stublist) == 3  # 2 remotes and 1 local
-    assert stublist[0].fname == "file1"
-    assert stublist[0].gitref.sha == "abc123"
-    assert stublist[1].fname == "file2"
-    assert stublist[1].gitref.sha == "123456"
+    # 2 remotes and 1 local
+    assert [(stub.is_remote, stub.fname) for stub in stublist] == [
+        (True, "file1.ext1"),
+        (True, "file2.ext2"),
+        (False, None),
+    ]
+    assert [stub.gitref.sha for stub in stublist.remote_stubs] == ["abc123", "123456"]
 
 
 @pytest.mark.parametrize(
     "fname",
-    ["some_filename", None],
-    ids=["valid_fname", "None_fname"],
+    [
+        pytest.param("some_filename", id="valid_fname"),
+        pytest.param(None, id="None_fname"),
+    ],
 )
-@patch("include_stubs.utils.os.listdir")
-@patch("include_stubs.utils.get_unique_stub_fname")
-def test_StubList_populate_local_stub_fname(
-    mock_get_unique_stub_fname,
-    mock_os_listdir,
-    fname,
-    mock_stublist,
-):
+def test_StubList_populate_local_stub_fname(monkeypatch, fname, mock_stublist):
     """
     Test StubList's _populate_local_stub_fname method.
     """
     stublist = mock_stublist()
-    mock_get_unique_stub_fname.return_value = fname
+    monkeypatch.setattr(utils.os, "listdir", MagicMock())
+    monkeypatch.setattr(utils, "get_unique_stub_fname", MagicMock(return_value=fname))
     stublist._populate_local_stub_fname()
     if fname is None:
         assert len(stublist) == 4  # only remotes
         assert all(stub.is_remote is True for stub in stublist)
     else:
         assert len(stublist) == 5  # all stublist
-        stublist[3].fname = fname
+        assert stublist[3].fname == fname
 
 
 @pytest.mark.parametrize(
-    "rate_limit_reached",
-    [True, False],
-    ids=["rate_limit_reached", "rate_limit_not_reached"],
-)
-@patch(
-    "include_stubs.utils.StubList._get_graphql_query_string",
-    return_value=graphql_query_string,
+    "mock_gh_rate_limit_reached",
+    [
+        pytest.param(True, id="rate_limit_reached"),
+        pytest.param(False, id="rate_limit_not_reached"),
+    ],
+    indirect=True,
 )
 def test_StubList_populate_remote_stub_fnames_api_request_fail(
-    mock_get_graphql_query_string, rate_limit_reached, fp, mock_stublist
+    graphql_command,
+    cmd_registry,
+    mock_stublist,
+    mock_gh_rate_limit_reached,
 ):
     """
     Test StubList's _populate_remote_stub_fnames method.
     """
     stublist = mock_stublist()
-    command = [
-        "gh",
-        "api",
-        "graphql",
-        "-f",
-        f"query={mock_get_graphql_query_string.return_value}",
-    ]
-    fp.register(command, returncode=1)
-    if rate_limit_reached:
+    cmd_registry.add(graphql_command, returncode=1)
+    if mock_gh_rate_limit_reached.return_value:
         exc_class = GitHubApiRateLimitError
     else:
         exc_class = ValueError
-    with (
-        patch(
-            "include_stubs.utils.gh_rate_limit_reached", return_value=rate_limit_reached
-        ),
-        pytest.raises(exc_class),
-    ):
+    with pytest.raises(exc_class):
         stublist._populate_remote_stub_fnames()
 
 
-@patch("include_stubs.utils.requests.get")
 def test_StubList_populate_remote_stub_contents(
-    mock_requests_get,
+    cmd_registry,
     mock_stublist,
 ):
     """
     Test StubList's _populate_remote_stub_contents method.
     """
     stublist = mock_stublist()
-    # Mock the requests.get method to return different contents for each call.
-    mock_requests_get.side_effect = [
-        MagicMock(text="example content", raise_for_status=MagicMock()),
-        MagicMock(
-            text="example content 2",
-            raise_for_status=MagicMock(side_effect=RequestException),
-        ),
-        MagicMock(text="example content 3", raise_for_status=MagicMock()),
-        MagicMock(text="example content 4", raise_for_status=MagicMock()),
+    stublist.append(Stub(gitref=GitRef(name="large", sha="901234")))
+    stublist.append(Stub(gitref=GitRef(name="tree", sha="567890")))
+    for i, stub in enumerate(stublist.remote_stubs):
+        stub.fname = f"stub{i}.md"
+    command = (
+        "gh",
+        "api",
+        "graphql",
+        "-f",
+        f"query={stublist._get_graphql_contents_query_string()}",
+    )
+    graphql_output = {
+        "data": {
+            "repository": {
+                "r_abc123": {"text": "example content", "isTruncated": False},
+                # Missing file
+                "r_def456": None,
+                "r_123456": {"text": "example content 3", "isTruncated": False},
+                # Binary file
+                "r_345678": {"text": None, "isTruncated": False},
+                # File too large to be retrieved in full
+                "r_901234": {"text": "truncated cont", "isTruncated": True},
+                # Not a blob (e.g., a directory with a stub-like name)
+                "r_567890": {},
+            }
+        }
+    }
+    cmd_registry.add(command, stdout=json.dumps(graphql_output))
+    stublist._populate_remote_stub_contents()
+    assert cmd_registry.calls == [command]
+    # 2 remotes and 1 local, which should not be modified
+    assert [(stub.gitref, stub.content) for stub in stublist] == [
+        (GitRef(name="main", sha="abc123"), "example content"),
+        (GitRef(name="other", sha="123456"), "example content 3"),
+        (None, None),
     ]
+
+
+def test_StubList_populate_remote_stub_contents_no_remote_stubs(
+    cmd_registry,
+    mock_stublist,
+):
+    """
+    Test StubList's _populate_remote_stub_contents method does not query the
+    GitHub API when there are no remote stubs.
+    """
+    stublist = mock_stublist(stubs=[Stub(is_remote=False)])
     stublist._populate_remote_stub_contents()
-    assert len(stublist) == 4  # 3 remotes and 1 local
-    assert stublist[0].content == "example content"
-    assert stublist[1].content == "example content 3"
-    # stublist[2] is the local stub, which should not be modified.
-    assert stublist[3].content == "example content 4"
+    assert cmd_registry.calls == []
 
 
 @pytest.mark.parametrize(
     "local_stub_exists",
-    [True, False],
-    ids=["local_stub_exists", "no_local_stub"],
+    [
+        pytest.param(True, id="local_stub_exists"),
+        pytest.param(False, id="no_local_stub"),
+    ],
 )
-@patch("include_stubs.utils.os.path.join")
-@patch("include_stubs.utils.open")
 def test_StubList_populate_local_stub_content(
-    mock_builtin_open,
-    mock_os_path_join,
+    monkeypatch,
     local_stub_exists,
     mock_stublist,
 ):
@@ -1008,52 +1054,71 @@ def test_StubList_populate_local_stub_content(
     Test StubList's _populate_local_stub_content method.
     """
     stublist = mock_stublist()
-    mock_builtin_open.side_effect = mock_open(read_data="example content")
-    if not local_stub_exists:
+    # A plain in-memory file is enough here, and much lighter than mock_open
+    mock_builtin_open = MagicMock(
+        side_effect=lambda *args, **kwargs: StringIO("example content")
+    )
+    monkeypatch.setattr(utils, "open", mock_builtin_open, raising=False)
+    if local_stub_exists:
+        stublist[3].fname = "local_stub.md"
+    else:
         del stublist[3]  # Remove the local stub if it shouldn't exist.
     stublist._populate_local_stub_content()
     if local_stub_exists:
         assert stublist[3].content == "example content"
+        mock_builtin_open.assert_called_once_with(
+            os.path.join(stublist.stubs_dir, stublist[3].fname), "r", encoding="utf-8"
+        )
     else:
-        mock_os_path_join.assert_not_called()
         mock_builtin_open.assert_not_called()
 
 
-@patch("include_stubs.utils.get_html_title")
-@patch("include_stubs.utils.get_md_title")
-def test_StubList_populate_remote_stub_titles(
-    mock_get_md_title, mock_get_html_title, mock_stublist
-):
+@pytest.fixture
+def mock_title_getters(monkeypatch):
+    """Replace the functions used to get the stub titles with mocks."""
+    mocks = {".html": MagicMock(), ".md": MagicMock()}
+    for extension, mock in mocks.items():
+        monkeypatch.setitem(utils.TITLE_GETTERS, extension, mock)
+    return mocks
+
+
+def test_StubList_populate_remote_stub_titles(mock_stublist, mock_title_getters):
     """
     Test StubList's _populate_remote_stub_titles method.
     """
+    mock_get_md_title = mock_title_getters[".md"]
+    mock_get_html_title = mock_title_getters[".html"]
     stublist = mock_stublist()
     # Set the fname for each remote stub.
-    fnames = iter(("some_name.html", "some_other_name.md", ".md", ".html"))
+    fnames = iter(("some_name.html", "some_other_name.md", "stub.md", "stub.html"))
     for i in (0, 1, 2, 4):
         stublist[i].fname = next(fnames)
     stublist._populate_remote_stub_titles()
-    assert len(stublist) == 5
-    assert stublist[0].title == mock_get_html_title.return_value
-    assert stublist[1].title == mock_get_md_title.return_value
-    assert stublist[2].title == mock_get_md_title.return_value
-    assert stublist[3].title is None  # local stub should not be modified
-    assert stublist[4].title == mock_get_html_title.return_value
+    html_title = mock_get_html_title.return_value
+    md_title = mock_get_md_title.return_value
+    # The local stub (index 3) should not be modified
+    assert [stub.title for stub in stublist] == [
+        html_title,
+        md_title,
+        md_title,
+        None,
+        html_title,
+    ]
 
 
 @pytest.mark.parametrize(
     "fname",
-    ["some_name.html", "some_other_name.md"],
-    ids=["html_file", "md_file"],
+    [
+        pytest.param("some_name.html", id="html_file"),
+        pytest.param("some_other_name.md", id="md_file"),
+    ],
 )
-@patch("include_stubs.utils.get_html_title")
-@patch("include_stubs.utils.get_md_title")
-def test_StubList_populate_local_stub_title(
-    mock_get_md_title, mock_get_html_title, mock_stublist, fname
-):
+def test_StubList_populate_local_stub_title(mock_stublist, mock_title_getters, fname):
     """
     Test StubList's _populate_local_stub_title method.
     """
+    mock_get_md_title = mock_title_getters[".md"]
+    mock_get_html_title = mock_title_getters[".html"]
     stublist = mock_stublist()
     # Set the fname for the local stub.
     stublist[3].fname = fname
@@ -1068,14 +1133,13 @@ def test_StubList_populate_local_stub_title(
     ] * 4  # remote stubs should not be modified
 
 
-@patch("include_stubs.utils.make_file_unique")
-@patch("include_stubs.utils.StubList._create_stub_file")
-def test_StubList_populate_remote_stub_files(
-    mock_create_stub_file, mock_make_file_unique, mock_stublist
-):
+def test_StubList_populate_remote_stub_files(monkeypatch, mock_stublist):
     """
     Test StubList's _populate_remote_stub_files method.
     """
+    mock_create_stub_file = MagicMock()
+    monkeypatch.setattr(utils, "make_file_unique", MagicMock())
+    monkeypatch.setattr(utils.StubList, "_create_stub_file", mock_create_stub_file)
     stublist = mock_stublist()
     stublist._populate_remote_stub_files()
     # Make sure that the make_file_unique function was called once for all remote stubs
@@ -1090,14 +1154,13 @@ def test_StubList_populate_remote_stub_files(
     assert stublist[3].file is None  # Local stub should not be modified
 
 
-@patch("include_stubs.utils.make_file_unique")
-@patch("include_stubs.utils.StubList._create_stub_file")
-def test_StubList_populate_local_stub_file(
-    mock_create_stub_file, mock_make_file_unique, mock_stublist
-):
+def test_StubList_populate_local_stub_file(monkeypatch, mock_stublist):
     """
     Test StubList's _populate_local_stub_file method.
     """
+    mock_create_stub_file = MagicMock()
+    monkeypatch.setattr(utils, "make_file_unique", MagicMock())
+    monkeypatch.setattr(utils.StubList, "_create_stub_file", mock_create_stub_file)
     stublist = mock_stublist()
     stublist._populate_local_stub_file()
     # Make sure that the make_file_unique function was called once
@@ -1113,14 +1176,16 @@ def test_StubList_populate_local_stub_file(
     ] * 4  # remote stubs should not be modified
 
 
-@patch("include_stubs.utils.File")
-@patch("include_stubs.utils.get_dest_uri_for_local_stub")
-def test_StubList_create_stub_file(
-    mock_get_dest_uri_for_local_stub, mock_File, mock_stublist
-):
+def test_StubList_create_stub_file(monkeypatch, mock_stublist):
     """
     Test StubList's _create_stub_file method.
     """
+    mock_File = MagicMock()
+    mock_get_dest_uri_for_local_stub = MagicMock()
+    monkeypatch.setattr(utils, "File", mock_File)
+    monkeypatch.setattr(
+        utils, "get_dest_uri_for_local_stub", mock_get_dest_uri_for_local_stub
+    )
     stublist = mock_stublist()
     output = stublist._create_stub_file(stublist[0])
     assert output == mock_File.generated.return_value
@@ -1137,7 +1202,7 @@ def test_StubList_populate_remote_stub_pages(mock_stublist):
     stublist = mock_stublist()
     # Set stubs files
     for i in (0, 1, 2, 4):
-        stublist[i].file = MagicMock(src_uri=f"ex_uri_{i}")
+        stublist[i].file = SimpleNamespace(src_uri=f"ex_uri_{i}")
     # Set some stubs titles
     stublist[1].title = "example title"
     stublist[2].title = "title"
@@ -1153,8 +1218,10 @@ def test_StubList_populate_remote_stub_pages(mock_stublist):
 
 @pytest.mark.parametrize(
     "title",
-    ["some title", None],
-    ids=["valid_title", "title_None"],
+    [
+        pytest.param("some title", id="valid_title"),
+        pytest.param(None, id="title_None"),
+    ],
 )
 def test_StubList_populate_local_stub_page(mock_stublist, title):
     """
@@ -1162,68 +1229,76 @@ def test_StubList_populate_local_stub_page(mock_stublist, title):
     """
     stublist = mock_stublist()
     # Set stubs file
-    stublist[3].file = MagicMock(src_uri="example_uri")
+    stublist[3].file = SimpleNamespace(src_uri="example_uri")
     # Set a title
     stublist[3].title = title
     stublist._populate_local_stub_page()
     # Make sure the number of stubs hasn't changed
     assert len(stublist) == 5
     for i in (0, 1, 2, 4):
-        assert stublist[0].page is None  # remote stubs should not be modified
+        assert stublist[i].page is None  # remote stubs should not be modified
     if title is None:
         assert stublist[3].page.title == "Example_uri"
     else:
         assert stublist[3].page.title == title
 
 
-@patch("include_stubs.utils.StubList._populate_remote_stub_fnames")
-@patch("include_stubs.utils.StubList._populate_remote_stub_contents")
-@patch("include_stubs.utils.StubList._populate_remote_stub_titles")
-@patch("include_stubs.utils.StubList._populate_remote_stub_files")
-@patch("include_stubs.utils.StubList._populate_remote_stub_pages")
-def test_StubList_populate_remote_stubs(
-    mock_populate_remote_pages,
-    mock_populate_remote_files,
-    mock_populate_remote_titles,
-    mock_populate_remote_contents,
-    mock_populate_remote_fnames,
-    mock_stublist,
-):
+REMOTE_STUB_POPULATORS = (
+    "_populate_remote_stub_fnames",
+    "_populate_remote_stub_contents",
+    "_populate_remote_stub_titles",
+    "_populate_remote_stub_files",
+    "_populate_remote_stub_pages",
+)
+LOCAL_STUB_POPULATORS = (
+    "_populate_local_stub_fname",
+    "_populate_local_stub_content",
+    "_populate_local_stub_title",
+    "_populate_local_stub_file",
+    "_populate_local_stub_page",
+)
+
+
+@pytest.fixture
+def mock_populators(monkeypatch):
+    """
+    Factory fixture replacing the given StubList populator methods with mocks.
+
+    Returns:
+        Callable
+            A function taking the method names and returning the list of mocks.
+    """
+
+    def _mock_populators(names):
+        mocks = [MagicMock() for _ in names]
+        for name, mock in zip(names, mocks):
+            monkeypatch.setattr(utils.StubList, name, mock)
+        return mocks
+
+    return _mock_populators
+
+
+def test_StubList_populate_remote_stubs(mock_stublist, mock_populators):
     """
     Test StubList's populate_remote_stubs method.
     """
+    mocks = mock_populators(REMOTE_STUB_POPULATORS)
     stublist = mock_stublist()
     stublist.populate_remote_stubs()
-    mock_populate_remote_pages.assert_called_once()
-    mock_populate_remote_files.assert_called_once()
-    mock_populate_remote_titles.assert_called_once()
-    mock_populate_remote_contents.assert_called_once()
-    mock_populate_remote_fnames.assert_called_once()
-
-
-@patch("include_stubs.utils.StubList._populate_local_stub_fname")
-@patch("include_stubs.utils.StubList._populate_local_stub_content")
-@patch("include_stubs.utils.StubList._populate_local_stub_title")
-@patch("include_stubs.utils.StubList._populate_local_stub_file")
-@patch("include_stubs.utils.StubList._populate_local_stub_page")
-def test_StubList_populate_local_stub(
-    mock_populate_local_page,
-    mock_populate_local_file,
-    mock_populate_local_title,
-    mock_populate_local_content,
-    mock_populate_local_fname,
-    mock_stublist,
-):
+    for mock in mocks:
+        mock.assert_called_once()
+
+
+def test_StubList_populate_local_stub(mock_stublist, mock_populators):
     """
     Test StubList's populate_local_stub method.
     """
+    mocks = mock_populators(LOCAL_STUB_POPULATORS)
     stublist = mock_stublist()
     stublist.populate_local_stub()
-    mock_populate_local_page.assert_called_once()
-    mock_populate_local_file.assert_called_once()
-    mock_populate_local_title.assert_called_once()
-    mock_populate_local_content.assert_called_once()
-    mock_populate_local_fname.assert_called_once()
+    for mock in mocks:
+        mock.assert_called_once()
+
 
 def test_Stub_init_raise():
     """Test Stub initialisation."""